@@ -5,15 +5,19 @@
 import logging
 import os
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import hvac
 
 from django.core.exceptions import ImproperlyConfigured
-from django.db import OperationalError
+from django.db import OperationalError, connections
 
 from django_informixdb import base
 
+from .secondaries import DEFAULT_SECONDARY_EJECT_SECONDS, server_health
+
 threading_lock = threading.Lock()
 
 logger = logging.getLogger(__name__)
@@ -32,6 +36,12 @@ class DatabaseWrapper(base.DatabaseWrapper):
 
     DEFAULT_MAXIMUM_CREDENTIAL_LIFETIME = 3600
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if self._is_group_member():
+            self.execute_wrappers.append(self._observe_query)
+
     def _get_vault_uri(self):
         vault_uri = self.settings_dict.get('VAULT_ADDR', None)
         if not vault_uri and 'VAULT_ADDR' in os.environ:
@@ -187,6 +197,58 @@ class DatabaseWrapper(base.DatabaseWrapper):
             return elapsed.total_seconds() >= maximum_credential_lifetime
         return bool(maximum_credential_lifetime)
 
+    def _store_credentials(self, username, password):
+        logger.info(
+            f"Retrieved username ({username}) and password from Vault"
+            f" for database server {self.settings_dict['SERVER']}"
+        )
+        self.settings_dict['USER'] = username
+        self.settings_dict['PASSWORD'] = password
+        self.settings_dict['CREDENTIALS_START_TIME'] = datetime.now()
+
+    def _is_group_member(self):
+        return 'PRIMARY' in self.settings_dict or bool(self.settings_dict.get('SECONDARY_ALIASES'))
+
+    def _is_secondary(self):
+        return 'PRIMARY' in self.settings_dict
+
+    def _get_group_aliases(self):
+        primary_alias = self.settings_dict.get('PRIMARY', self.alias)
+        primary_settings = connections.databases[primary_alias]
+        return [primary_alias, *primary_settings.get('SECONDARY_ALIASES', [])]
+
+    def _eject(self):
+        eject_seconds = self.settings_dict.get('SECONDARY_EJECT_SECONDS', DEFAULT_SECONDARY_EJECT_SECONDS)
+        server_health.eject(self.alias, eject_seconds)
+
+    def _refresh_group_credentials(self):
+        """
+        Gets credentials from Vault for every server of a primary/secondary group at once
+
+        Only a failure to get credentials for this server is raised, other secondaries are ejected instead.
+        """
+        members = [self]
+        for alias in self._get_group_aliases():
+            if alias != self.alias:
+                member = connections[alias]
+                if member._credentials_need_refresh():  # pylint: disable=protected-access
+                    members.append(member)
+
+        with ThreadPoolExecutor(max_workers=len(members)) as executor:
+            futures = [executor.submit(member.get_credentials_from_vault) for member in members]
+
+        for member, future in zip(members, futures):
+            try:
+                username, password = future.result()
+            except Exception as err:  # pylint: disable=broad-except
+                if member is self:
+                    raise
+                logger.warning(f"Failed to retrieve credentials from Vault for database {member.alias}: {err}")
+                if member._is_secondary():  # pylint: disable=protected-access
+                    member._eject()  # pylint: disable=protected-access
+                continue
+            member._store_credentials(username, password)  # pylint: disable=protected-access
+
     def get_connection_params(self):
         """Returns connection parameters for Informix, with credentials from Vault"""
         # django_informixdb expects USER and PASSWORD, so fake them if missing
@@ -209,19 +271,50 @@ class DatabaseWrapper(base.DatabaseWrapper):
 
         with threading_lock:
             if self._credentials_need_refresh():
-                username, password = self.get_credentials_from_vault()
-                logger.info(
-                    f"Retrieved username ({username}) and password from Vault"
-                    f" for database server {self.settings_dict['SERVER']}"
-                )
-                self.settings_dict['USER'] = username
-                self.settings_dict['PASSWORD'] = password
-                self.settings_dict['CREDENTIALS_START_TIME'] = datetime.now()
-            else:
-                username = self.settings_dict['USER']
-                password = self.settings_dict['PASSWORD']
+                if self._is_group_member():
+                    self._refresh_group_credentials()
+                else:
+                    self._store_credentials(*self.get_credentials_from_vault())
+
+            username = self.settings_dict['USER']
+            password = self.settings_dict['PASSWORD']
 
         conn_params['USER'] = username
         conn_params['PASSWORD'] = password
 
         return conn_params
+
+    def connect(self):
+        """Connects to the database, ejecting secondaries which fail from read routing"""
+        try:
+            super().connect()
+        except Exception:
+            if self._is_secondary():
+                self._eject()
+            raise
+
+    def get_new_connection(self, conn_params):
+        """Opens a connection, recording it as open for read routing"""
+        connection = super().get_new_connection(conn_params)
+        if self._is_group_member():
+            server_health.connection_opened(self.alias, self)
+        return connection
+
+    def _close(self):
+        try:
+            super()._close()
+        finally:
+            if self._is_group_member():
+                server_health.connection_closed(self.alias, self)
+
+    def _observe_query(self, execute, sql, params, many, context):
+        start = time.monotonic()
+        try:
+            result = execute(sql, params, many, context)
+        except OperationalError:
+            if self._is_secondary():
+                self._eject()
+            raise
+
+        server_health.record_latency(self.alias, time.monotonic() - start)
+        return result
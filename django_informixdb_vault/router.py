@@ -0,0 +1,68 @@
+"""django_informixdb_vault: database router for Informix HDR/RSS primary and secondary server groups"""
+
+# pylint: disable=unused-argument
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .secondaries import server_health
+
+
+class SecondaryReadRouter:
+    """
+    Routes reads across the healthy secondaries of a primary, and writes to the primary
+
+    Reads fall back to the primary when every secondary is ejected, or when the primary is
+    inside a transaction so that the transaction can read its own writes.
+
+    Django only hints which database a query belongs to when it has a model instance, so reads
+    without an instance hint are routed within the group of the `default` database.  List this
+    router last in DATABASE_ROUTERS so that other routers can place those reads first.  Writes
+    without an instance hint are left to other routers.
+    """
+
+    @staticmethod
+    def _get_primary_alias(alias):
+        return connections.databases.get(alias, {}).get('PRIMARY', alias)
+
+    def _get_hinted_primary_alias(self, hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:  # pylint: disable=protected-access
+            return self._get_primary_alias(instance._state.db)  # pylint: disable=protected-access
+        return None
+
+    def db_for_read(self, model, **hints):
+        """Returns the secondary best able to serve a read, or the primary if none are healthy"""
+        primary_alias = self._get_hinted_primary_alias(hints) or DEFAULT_DB_ALIAS
+        secondary_aliases = connections.databases.get(primary_alias, {}).get('SECONDARY_ALIASES')
+        if not secondary_aliases:
+            return None
+
+        if connections[primary_alias].in_atomic_block:
+            return primary_alias
+
+        healthy_aliases = [alias for alias in secondary_aliases if server_health.is_healthy(alias)]
+        if not healthy_aliases:
+            return primary_alias
+
+        return server_health.choose(healthy_aliases)
+
+    def db_for_write(self, model, **hints):
+        """Returns the primary of the server an instance was read from"""
+        primary_alias = self._get_hinted_primary_alias(hints)
+        if primary_alias and 'SECONDARY_ALIASES' in connections.databases.get(primary_alias, {}):
+            return primary_alias
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Allows relations between objects read from any server of the same primary"""
+        # pylint: disable=protected-access
+        if obj1._state.db and obj2._state.db:
+            if self._get_primary_alias(obj1._state.db) == self._get_primary_alias(obj2._state.db):
+                return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Prevents migrations on secondaries, they are replicated from the primary"""
+        if 'PRIMARY' in connections.databases.get(db, {}):
+            return False
+        return None
@@ -0,0 +1,169 @@
+"""django_informixdb_vault: Informix HDR/RSS primary and secondary server groups"""
+
+# pylint: disable=logging-fstring-interpolation
+
+import logging
+import random
+import threading
+import time
+import weakref
+
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SECONDARY_EJECT_SECONDS = 30
+
+# Weight given to the newest latency sample in the moving average
+LATENCY_SMOOTHING = 0.2
+
+# Settings which belong to a single server, so are never copied from a primary to its secondaries
+_PRIMARY_ONLY_SETTINGS = (
+    'SECONDARIES',
+    'SECONDARY_ALIASES',
+    'USER',
+    'PASSWORD',
+    'CREDENTIALS_START_TIME',
+    'TEST',
+)
+
+
+def expand_secondaries(databases):
+    """
+    Returns a copy of a DATABASES setting with an alias added for every entry in each `SECONDARIES` list
+
+    Each secondary inherits the settings of its primary, overridden by the settings given in its entry.
+    """
+    expanded = {}
+    for alias, settings_dict in databases.items():
+        secondaries = settings_dict.get('SECONDARIES') or []
+        if not secondaries:
+            expanded[alias] = settings_dict
+            continue
+
+        primary = dict(settings_dict)
+        primary['SECONDARY_ALIASES'] = []
+
+        for secondary in secondaries:
+            if 'SERVER' not in secondary:
+                raise ImproperlyConfigured(f"SERVER is a required setting for each secondary of {alias}")
+
+            secondary_alias = secondary.get('ALIAS', f"{alias}_{secondary['SERVER']}")
+            if secondary_alias in databases or secondary_alias in expanded:
+                raise ImproperlyConfigured(f"Secondary alias {secondary_alias} of {alias} is already in use")
+
+            secondary_settings = {
+                key: value for key, value in settings_dict.items() if key not in _PRIMARY_ONLY_SETTINGS
+            }
+            secondary_settings.update(
+                {key: value for key, value in secondary.items() if key != 'ALIAS'}
+            )
+            secondary_settings['PRIMARY'] = alias
+            # Secondaries are read-only copies of the primary, so tests must not create databases on them
+            secondary_settings['TEST'] = {'MIRROR': alias}
+
+            primary['SECONDARY_ALIASES'].append(secondary_alias)
+            expanded[secondary_alias] = secondary_settings
+
+        expanded[alias] = primary
+
+    return expanded
+
+
+class ServerHealth:
+    """
+    Thread safe record of the observed latency, open connections and ejections of each database alias
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency = {}
+        self._open_connections = {}
+        self._ejected_until = {}
+
+    def record_latency(self, alias, seconds):
+        """Adds a latency sample to the moving average for an alias"""
+        with self._lock:
+            if alias in self._latency:
+                self._latency[alias] += LATENCY_SMOOTHING * (seconds - self._latency[alias])
+            else:
+                self._latency[alias] = seconds
+
+    def get_latency(self, alias):
+        """Returns the moving average latency (seconds) for an alias, or None if nothing has been observed"""
+        with self._lock:
+            return self._latency.get(alias)
+
+    def connection_opened(self, alias, wrapper):
+        """Records a database wrapper holding an open connection to an alias"""
+        with self._lock:
+            self._open_connections.setdefault(alias, weakref.WeakSet()).add(wrapper)
+
+    def connection_closed(self, alias, wrapper):
+        """Records a database wrapper closing its connection to an alias"""
+        with self._lock:
+            if alias in self._open_connections:
+                self._open_connections[alias].discard(wrapper)
+
+    def get_open_connections(self, alias):
+        """
+        Returns the number of connections this process holds open to an alias
+
+        Wrappers are held by weak reference, so connections left open by threads which have exited
+        stop being counted once their wrapper is garbage collected.
+        """
+        with self._lock:
+            return len(self._open_connections.get(alias, ()))
+
+    def eject(self, alias, seconds=DEFAULT_SECONDARY_EJECT_SECONDS):
+        """Stops an alias being chosen for the given number of seconds"""
+        logger.warning(f"Ejecting database {alias} from read routing for {seconds} seconds")
+        with self._lock:
+            self._ejected_until[alias] = time.monotonic() + seconds
+            # Latency from before the failure no longer describes the server
+            self._latency.pop(alias, None)
+
+    def is_healthy(self, alias):
+        """Returns False while an alias is ejected"""
+        with self._lock:
+            ejected_until = self._ejected_until.get(alias)
+            if ejected_until is None:
+                return True
+            if time.monotonic() < ejected_until:
+                return False
+            del self._ejected_until[alias]
+
+        logger.info(f"Returning database {alias} to read routing")
+        return True
+
+    def choose(self, aliases):
+        """
+        Picks one of the given aliases at random, weighted towards low latency and few open connections
+
+        Aliases without any observed latency are treated as being as fast as the fastest alias,
+        so that new and returning servers receive enough queries to be measured.
+        """
+        with self._lock:
+            latencies = {alias: self._latency.get(alias) for alias in aliases}
+            open_connections = {alias: len(self._open_connections.get(alias, ())) for alias in aliases}
+
+        observed = [latency for latency in latencies.values() if latency is not None]
+        default_latency = min(observed) if observed else 1.0
+
+        weights = []
+        for alias in aliases:
+            latency = latencies[alias] if latencies[alias] is not None else default_latency
+            # Guard against a zero latency from a coarse clock
+            weights.append(1.0 / (max(latency, 1e-6) * (1 + open_connections[alias])))
+
+        return random.choices(aliases, weights=weights)[0]
+
+    def reset(self):
+        """Forgets everything observed so far"""
+        with self._lock:
+            self._latency.clear()
+            self._open_connections.clear()
+            self._ejected_until.clear()
+
+
+server_health = ServerHealth()
@@ -3,10 +3,13 @@
 import random
 import time
 
+import pyodbc
 import pytest
 
 from django.db import OperationalError
+from django.db.utils import ConnectionHandler
 from django_informixdb_vault.base import DatabaseWrapper as VaultDatabaseWrapper
+from django_informixdb_vault.secondaries import expand_secondaries, server_health
 
 from .thread_utils import PropagatingThread
 
@@ -233,4 +236,137 @@ def test_credentials_need_refresh(mocker, db_wrapper):
                  return_value=datetime(2023, 1, 1, 12, 30, 0))
 
     # Assert that credentials do not need refresh within the lifetime
-    assert db_wrapper._credentials_need_refresh() is False
\ No newline at end of file
+    assert db_wrapper._credentials_need_refresh() is False
+
+
+SECONDARY = 'default_informix_rss1'
+
+
+@pytest.fixture
+def vault_secrets():
+    return {
+        'kv/ifx/creds': ('informix', 'in4mix'),
+        'kv/ifx/rss1': ('informix_rss', 'in4mix_rss'),
+    }
+
+
+@pytest.fixture
+def group_connections(mocker, vault_secrets, django_db_blocker):
+    """Connections to a primary and one secondary, with Vault and the Informix driver patched out"""
+    connections = ConnectionHandler(expand_secondaries({
+        'default': {
+            'ENGINE': 'django_informixdb_vault',
+            'SERVER': 'informix',
+            'NAME': 'sysmaster',
+            'VAULT_ADDR': 'http://vault:8200',
+            'VAULT_TOKEN': 'test-token',
+            'VAULT_PATH': 'kv/ifx/creds',
+            'SECONDARIES': [{'SERVER': 'informix_rss1', 'VAULT_PATH': 'kv/ifx/rss1'}],
+        },
+    }))
+    mocker.patch('django_informixdb_vault.base.connections', connections)
+
+    def get_credentials_from_vault(wrapper):
+        vault_path = wrapper.settings_dict['VAULT_PATH']
+        if vault_path not in vault_secrets:
+            raise OperationalError(f"No data found at path '{vault_path}'")
+        return vault_secrets[vault_path]
+
+    mocker.patch.object(VaultDatabaseWrapper, 'get_credentials_from_vault', autospec=True,
+                        side_effect=get_credentials_from_vault)
+    mocker.patch('django_informixdb.base.DatabaseWrapper.get_connection_params', autospec=True,
+                 side_effect=lambda wrapper: dict(wrapper.settings_dict))
+    mocker.patch('django_informixdb.base.DatabaseWrapper.get_new_connection',
+                 side_effect=lambda conn_params: MagicMock())
+
+    server_health.reset()
+    with django_db_blocker.unblock():
+        yield connections
+    server_health.reset()
+
+
+def test_connect_primary_refreshes_group_credentials(group_connections):
+    group_connections['default'].connect()
+
+    assert group_connections['default'].settings_dict['USER'] == 'informix'
+    assert group_connections[SECONDARY].settings_dict['USER'] == 'informix_rss'
+    assert group_connections[SECONDARY].settings_dict['PASSWORD'] == 'in4mix_rss'
+
+
+def test_connect_primary_ejects_secondary_without_credentials(group_connections, vault_secrets):
+    del vault_secrets['kv/ifx/rss1']
+
+    group_connections['default'].connect()
+
+    assert group_connections['default'].settings_dict['USER'] == 'informix'
+    assert server_health.is_healthy(SECONDARY) is False
+
+
+def test_connect_secondary_ejected_without_credentials(group_connections, vault_secrets):
+    del vault_secrets['kv/ifx/rss1']
+
+    with pytest.raises(OperationalError):
+        group_connections[SECONDARY].connect()
+
+    assert server_health.is_healthy(SECONDARY) is False
+    assert server_health.is_healthy('default') is True
+
+
+def test_connect_secondary_ejected_when_connection_fails(group_connections, mocker):
+    mocker.patch('django_informixdb.base.DatabaseWrapper.get_new_connection',
+                 side_effect=pyodbc.OperationalError('08001', 'Unable to connect'))
+
+    with pytest.raises(pyodbc.OperationalError):
+        group_connections[SECONDARY].connect()
+
+    assert server_health.is_healthy(SECONDARY) is False
+
+
+def test_connect_counts_open_connections(group_connections):
+    secondary = group_connections[SECONDARY]
+
+    secondary.connect()
+    assert server_health.get_open_connections(SECONDARY) == 1
+    # Only query execution contributes to latency, not logging in
+    assert server_health.get_latency(SECONDARY) is None
+
+    secondary.close()
+    assert server_health.get_open_connections(SECONDARY) == 0
+
+
+def test_query_records_latency(group_connections):
+    secondary = group_connections[SECONDARY]
+
+    with secondary.cursor() as cursor:
+        cursor.execute('SELECT 1 FROM sysmaster:sysdual')
+
+    assert server_health.get_latency(SECONDARY) is not None
+    assert server_health.is_healthy(SECONDARY) is True
+
+
+def test_query_operational_error_ejects_secondary(group_connections):
+    secondary = group_connections[SECONDARY]
+    secondary.connect()
+    secondary.connection.cursor.return_value.execute.side_effect = pyodbc.OperationalError(
+        '08S01', 'Communication link failure'
+    )
+
+    with pytest.raises(OperationalError):
+        with secondary.cursor() as cursor:
+            cursor.execute('SELECT 1 FROM sysmaster:sysdual')
+
+    assert server_health.is_healthy(SECONDARY) is False
+
+
+def test_query_operational_error_does_not_eject_primary(group_connections):
+    primary = group_connections['default']
+    primary.connect()
+    primary.connection.cursor.return_value.execute.side_effect = pyodbc.OperationalError(
+        '08S01', 'Communication link failure'
+    )
+
+    with pytest.raises(OperationalError):
+        with primary.cursor() as cursor:
+            cursor.execute('SELECT 1 FROM sysmaster:sysdual')
+
+    assert server_health.is_healthy('default') is True
@@ -0,0 +1,109 @@
+"""Tests for django_informix_vault/router.py
+"""
+import pytest
+
+from unittest.mock import MagicMock
+
+from django.db.utils import ConnectionRouter
+
+from django_informixdb_vault.router import SecondaryReadRouter
+from django_informixdb_vault.secondaries import server_health
+
+
+@pytest.fixture(autouse=True)
+def reset_server_health():
+    server_health.reset()
+    yield
+    server_health.reset()
+
+
+@pytest.fixture
+def mock_connections(mocker):
+    connections = mocker.patch("django_informixdb_vault.router.connections")
+    connections.databases = {
+        "default": {"SERVER": "informix", "SECONDARY_ALIASES": ["rss1", "rss2"]},
+        "rss1": {"SERVER": "informix_rss1", "PRIMARY": "default"},
+        "rss2": {"SERVER": "informix_rss2", "PRIMARY": "default"},
+        "legacy": {"SERVER": "informix_legacy"},
+    }
+    connections.__getitem__.return_value.in_atomic_block = False
+    return connections
+
+
+@pytest.fixture
+def router():
+    return SecondaryReadRouter()
+
+
+def instance_from(alias):
+    instance = MagicMock()
+    instance._state.db = alias
+    return instance
+
+
+def test_db_for_read_chooses_secondary(mock_connections, router):
+    assert router.db_for_read(None) in ("rss1", "rss2")
+
+
+def test_db_for_read_skips_ejected_secondary(mock_connections, router):
+    server_health.eject("rss1")
+
+    assert router.db_for_read(None) == "rss2"
+
+
+def test_db_for_read_falls_back_to_primary(mock_connections, router):
+    server_health.eject("rss1")
+    server_health.eject("rss2")
+
+    assert router.db_for_read(None) == "default"
+
+
+def test_db_for_read_in_transaction_uses_primary(mock_connections, router):
+    mock_connections.__getitem__.return_value.in_atomic_block = True
+
+    assert router.db_for_read(None) == "default"
+
+
+def test_db_for_read_without_secondaries(mock_connections, router):
+    assert router.db_for_read(None, instance=instance_from("legacy")) is None
+
+
+def test_db_for_write_uses_primary(mock_connections, router):
+    assert router.db_for_write(None, instance=instance_from("rss2")) == "default"
+    assert router.db_for_write(None, instance=instance_from("legacy")) is None
+
+
+def test_db_for_write_without_hint(mock_connections, router):
+    assert router.db_for_write(None) is None
+
+
+class LegacyRouter:
+    """Sends every model to the "legacy" database, which has no secondaries"""
+
+    def db_for_read(self, model, **hints):
+        return "legacy"
+
+    def db_for_write(self, model, **hints):
+        return "legacy"
+
+
+def test_unhinted_write_left_to_later_router(mock_connections, router):
+    connection_router = ConnectionRouter([router, LegacyRouter()])
+
+    assert connection_router.db_for_write(None) == "legacy"
+
+
+def test_unhinted_read_placed_by_earlier_router(mock_connections, router):
+    connection_router = ConnectionRouter([LegacyRouter(), router])
+
+    assert connection_router.db_for_read(None) == "legacy"
+
+
+def test_allow_relation(mock_connections, router):
+    assert router.allow_relation(instance_from("rss1"), instance_from("default")) is True
+    assert router.allow_relation(instance_from("rss1"), instance_from("legacy")) is None
+
+
+def test_allow_migrate(mock_connections, router):
+    assert router.allow_migrate("rss1", "datatypes") is False
+    assert router.allow_migrate("default", "datatypes") is None
@@ -0,0 +1,152 @@
+"""Tests for django_informix_vault/secondaries.py
+"""
+import gc
+
+import pytest
+
+from django.core.exceptions import ImproperlyConfigured
+from django_informixdb_vault.secondaries import ServerHealth, expand_secondaries
+
+
+@pytest.fixture
+def databases():
+    return {
+        "default": {
+            "ENGINE": "django_informixdb_vault",
+            "SERVER": "informix",
+            "NAME": "adapter",
+            "VAULT_ADDR": "http://vault:8200",
+            "VAULT_PATH": "kv/ifx/creds",
+            "SECONDARIES": [
+                {"SERVER": "informix_rss1", "VAULT_PATH": "kv/ifx/rss1"},
+                {"SERVER": "informix_rss2", "ALIAS": "reporting"},
+            ],
+        },
+    }
+
+
+def test_expand_secondaries(databases):
+    expanded = expand_secondaries(databases)
+
+    assert list(expanded) == ["default_informix_rss1", "reporting", "default"]
+    assert expanded["default"]["SECONDARY_ALIASES"] == ["default_informix_rss1", "reporting"]
+
+    rss1 = expanded["default_informix_rss1"]
+    assert rss1["SERVER"] == "informix_rss1"
+    assert rss1["VAULT_PATH"] == "kv/ifx/rss1"
+    assert rss1["VAULT_ADDR"] == "http://vault:8200"
+    assert rss1["PRIMARY"] == "default"
+    assert rss1["TEST"] == {"MIRROR": "default"}
+    assert "SECONDARIES" not in rss1
+
+    # Secondaries without a VAULT_PATH share the primary's credentials
+    assert expanded["reporting"]["VAULT_PATH"] == "kv/ifx/creds"
+    assert "ALIAS" not in expanded["reporting"]
+
+
+def test_expand_secondaries_does_not_modify_databases(databases):
+    expand_secondaries(databases)
+
+    assert "SECONDARY_ALIASES" not in databases["default"]
+    assert list(databases) == ["default"]
+
+
+def test_expand_secondaries_requires_server(databases):
+    databases["default"]["SECONDARIES"].append({"VAULT_PATH": "kv/ifx/rss3"})
+
+    with pytest.raises(ImproperlyConfigured):
+        expand_secondaries(databases)
+
+
+def test_expand_secondaries_rejects_duplicate_alias(databases):
+    databases["reporting"] = {"ENGINE": "django_informixdb_vault"}
+
+    with pytest.raises(ImproperlyConfigured):
+        expand_secondaries(databases)
+
+
+def test_record_latency_moving_average():
+    health = ServerHealth()
+    health.record_latency("rss1", 1.0)
+    health.record_latency("rss1", 2.0)
+
+    assert health.get_latency("rss1") == pytest.approx(1.2)
+    assert health.get_latency("rss2") is None
+
+
+class Wrapper:
+    """Stands in for a DatabaseWrapper, which ServerHealth holds by weak reference"""
+
+
+def test_open_connections():
+    health = ServerHealth()
+    wrappers = [Wrapper(), Wrapper()]
+    health.connection_opened("rss1", wrappers[0])
+    health.connection_opened("rss1", wrappers[1])
+    health.connection_opened("rss1", wrappers[1])
+    health.connection_closed("rss1", wrappers[0])
+    health.connection_closed("rss2", wrappers[0])
+
+    assert health.get_open_connections("rss1") == 1
+    assert health.get_open_connections("rss2") == 0
+
+
+def test_open_connections_forgets_collected_wrappers():
+    health = ServerHealth()
+    wrapper = Wrapper()
+    health.connection_opened("rss1", wrapper)
+
+    del wrapper
+    gc.collect()
+
+    assert health.get_open_connections("rss1") == 0
+
+
+def test_eject(mocker):
+    health = ServerHealth()
+    health.record_latency("rss1", 1.0)
+    monotonic = mocker.patch("django_informixdb_vault.secondaries.time.monotonic", return_value=100.0)
+
+    health.eject("rss1", 30)
+
+    assert health.is_healthy("rss1") is False
+    assert health.get_latency("rss1") is None
+
+    monotonic.return_value = 130.0
+    assert health.is_healthy("rss1") is True
+
+
+def test_choose_prefers_fast_servers(mocker):
+    health = ServerHealth()
+    health.record_latency("rss1", 0.01)
+    health.record_latency("rss2", 0.09)
+    choices = mocker.patch("django_informixdb_vault.secondaries.random.choices", return_value=["rss1"])
+
+    assert health.choose(["rss1", "rss2"]) == "rss1"
+    weights = choices.call_args.kwargs["weights"]
+    assert weights[0] == pytest.approx(9 * weights[1])
+
+
+def test_choose_penalises_open_connections(mocker):
+    health = ServerHealth()
+    health.record_latency("rss1", 0.01)
+    health.record_latency("rss2", 0.01)
+    wrapper = Wrapper()
+    health.connection_opened("rss1", wrapper)
+    choices = mocker.patch("django_informixdb_vault.secondaries.random.choices", return_value=["rss2"])
+
+    health.choose(["rss1", "rss2"])
+
+    weights = choices.call_args.kwargs["weights"]
+    assert weights[1] == pytest.approx(2 * weights[0])
+
+
+def test_choose_treats_unmeasured_servers_as_fastest(mocker):
+    health = ServerHealth()
+    health.record_latency("rss1", 0.05)
+    choices = mocker.patch("django_informixdb_vault.secondaries.random.choices", return_value=["rss2"])
+
+    health.choose(["rss1", "rss2"])
+
+    weights = choices.call_args.kwargs["weights"]
+    assert weights[0] == pytest.approx(weights[1])